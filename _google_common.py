@@ -0,0 +1,197 @@
+"""
+Shared helpers for the gmail-checker-sender scripts
+JSON encoding, atomic file writes, OAuth tokens, cached API services
+and per-account fan-out
+"""
+
+import os
+import sys
+import json
+import time
+import pickle
+import tempfile
+from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+# Use orjson for JSON encode/decode when available
+try:
+    import orjson
+    
+    def _dumps(obj, indent=True):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj, indent=True):
+        return json.dumps(obj, indent=2 if indent else None)
+    
+    _loads = json.loads
+
+# Discovery document cache (skips the HTTPS fetch on every run)
+DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/{api}/{version}/rest"
+DISCOVERY_CACHE_DIR = Path.home() / ".nanobot" / "cache" / "discovery"
+DISCOVERY_MAX_AGE = 24 * 60 * 60  # Refresh once a day
+
+HTTP_TIMEOUT = 30  # Seconds
+
+# Upper bound on concurrent accounts for --accounts
+MAX_WORKERS = 8
+
+
+def _write_atomic(path, data):
+    """Write bytes via a temp file so readers never see a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def _save_token(creds, path):
+    """Atomically rewrite an OAuth token file with the current credentials"""
+    _write_atomic(path, creds.to_json().encode('utf-8'))
+
+
+def _cached_service(api, version, creds):
+    """Build an API service from a disk-cached discovery document"""
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build, build_from_document
+    
+    json_path = DISCOVERY_CACHE_DIR / f"{api}-{version}.json"
+    pickle_path = json_path.with_suffix('.pickle')
+    
+    try:
+        fresh = time.time() - json_path.stat().st_mtime < DISCOVERY_MAX_AGE
+    except OSError:
+        fresh = False
+    
+    # One persistent connection per service, reused across requests
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+    
+    doc = None
+    if not fresh:
+        try:
+            resp, content = httplib2.Http(timeout=HTTP_TIMEOUT).request(
+                DISCOVERY_URL.format(api=api, version=version))
+            if resp.status == 200:
+                doc = _loads(content)
+                _write_atomic(json_path, content)
+                _write_atomic(pickle_path, pickle.dumps(doc, pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            pass  # Fall back to whatever is cached on disk
+    
+    if doc is None:
+        # Pre-parsed pickle loads faster than json.loads on the large document
+        try:
+            with open(pickle_path, 'rb') as f:
+                doc = pickle.load(f)
+        except Exception:
+            try:
+                doc = _loads(json_path.read_bytes())
+            except Exception:
+                # Nothing cached and the fetch failed: use the bundled document
+                return build(api, version, http=http,
+                             cache_discovery=False, static_discovery=True)
+    
+    return build_from_document(doc, http=http)
+
+
+def migrate_pickle_token(legacy_path, json_path):
+    """One-shot conversion of a legacy pickled .token file to JSON"""
+    try:
+        with open(legacy_path, 'rb') as token:
+            creds = pickle.load(token)
+        _save_token(creds, json_path)
+    except Exception as e:
+        print(f"Error migrating {legacy_path} to JSON: {e}", file=sys.stderr)
+
+
+def get_credentials_path(account):
+    """Get path to OAuth token for account"""
+    base_path = Path.home() / ".nanobot" / "credentials" / "gmail"
+    token_file = base_path / f"{account.replace('@', '_at_')}.json"
+    
+    legacy_file = token_file.with_suffix('.token')
+    if not token_file.exists() and legacy_file.exists():
+        migrate_pickle_token(legacy_file, token_file)
+    
+    if not token_file.exists():
+        alt_path = Path.home() / ".nanobot" / "credentials" / f"{account}.json"
+        if alt_path.exists():
+            return alt_path
+    
+    return token_file if token_file.exists() else None
+
+
+def load_credentials(account):
+    """Load OAuth credentials for a Google account"""
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    
+    creds_path = get_credentials_path(account)
+    
+    if not creds_path:
+        return None
+    
+    try:
+        data = creds_path.read_bytes()
+        try:
+            # Keep the scopes stored in the token: every script shares this file
+            info = _loads(data)
+            creds = Credentials.from_authorized_user_info(info, info.get('scopes'))
+        except (ValueError, UnicodeDecodeError):
+            # Pickled token under a .json name: load it once and store it as JSON
+            creds = pickle.loads(data)
+            creds_path = creds_path.with_suffix('.json')
+            _save_token(creds, creds_path)
+        
+        if creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+            _save_token(creds, creds_path)
+        
+        return creds
+    except Exception as e:
+        print(f"Error loading credentials for {account}: {e}", file=sys.stderr)
+        return None
+
+
+@lru_cache(maxsize=8)
+def _load_service(account, api, version):
+    """Load credentials and build an API service once per process"""
+    # Raises rather than returning None: lru_cache does not keep exceptions,
+    # so a failed load is retried on the next call
+    creds = load_credentials(account)
+    if not creds:
+        raise RuntimeError(f'No credentials found for {account}. Run OAuth setup first.')
+    return creds, _cached_service(api, version, creds)
+
+
+def _get_service(account, api, version):
+    """Get the process-wide service for account, refreshing expired credentials"""
+    creds, service = _load_service(account, api, version)
+    if creds.expired and creds.refresh_token:
+        from google.auth.transport.requests import Request
+        creds.refresh(Request())
+        _save_token(creds, get_credentials_path(account))
+    
+    return service
+
+
+def parse_accounts(value):
+    """Split a comma-separated --accounts value, dropping blanks and duplicates"""
+    return list(dict.fromkeys(a.strip() for a in value.split(',') if a.strip()))
+
+
+def run_many(accounts, fn, *args, **kwargs):
+    """Run fn(account, *args, **kwargs) for each account concurrently, in account order"""
+    # Each account has its own cached service and connection; the work is
+    # network-bound, so the threads overlap their round-trips
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(accounts))) as executor:
+        futures = [executor.submit(fn, account, *args, **kwargs) for account in accounts]
+        return [future.result() for future in futures]
@@ -4,140 +4,257 @@ Add Calendar Event for LiveMoments
 Auto-routes TBC events to Administration calendar, confirmed to Main calendar
 """
 
-import os
+import re
 import sys
-import json
-import pickle
 import argparse
-from datetime import datetime, timedelta
-from pathlib import Path
+import datetime
+from itertools import islice
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from _google_common import _dumps, _get_service, _loads, parse_accounts, run_many
 
 # Calendar IDs
 CALENDAR_ADMIN = "jml0dbb0k0pq0qfdlhdo89oql0@group.calendar.google.com"  # Purple - TBC events
 CALENDAR_MAIN = "livemomentssg@gmail.com"  # Default - Confirmed events
+CALENDAR_PRIMARY = "primary"  # --accounts: each account's own calendar
+CALENDAR_NAMES = {
+    CALENDAR_ADMIN: 'Administration (Purple)',
+    CALENDAR_MAIN: 'Main',
+    CALENDAR_PRIMARY: 'Primary',
+}
 
 DEFAULT_ACCOUNT = "livemomentssg@gmail.com"
 
+# Shared event settings (built once, reused by every event body)
+TIMEZONE = "Asia/Singapore"
+REMINDERS = {
+    'useDefault': False,
+    'overrides': (
+        {'method': 'email', 'minutes': 7 * 24 * 60},  # 1 week
+        {'method': 'email', 'minutes': 3 * 24 * 60},  # 3 days
+    )
+}
+BASE_EVENT_BODY = {'reminders': REMINDERS}
+
+# Accepted --date / --start / --end formats
+DATE_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}\Z')
+TIME_RE = re.compile(r'([0-9]{1,2}):([0-9]{2})\Z')
+
+# Partial response: only the event fields we report back
+EVENT_FIELDS = 'id,htmlLink'
+
+# Google caps batch requests at 50 calls
+BATCH_LIMIT = 50
 
-def get_credentials_path(account):
-    """Get path to OAuth token for account"""
-    base_path = Path.home() / ".nanobot" / "credentials" / "gmail"
-    token_file = base_path / f"{account.replace('@', '_at_')}.token"
-    return token_file if token_file.exists() else None
+# Flags required when not using --events-file
+EVENT_FLAGS = ('company', 'poc', 'type', 'date', 'start', 'end', 'location', 'email_id')
 
+# Keys required on every --events-file row (email_id is optional there)
+EVENT_FILE_KEYS = ('company', 'poc', 'type', 'date', 'start', 'end', 'location')
+
+EVENT_TYPES = ('EVENT', 'LIVE')
+EVENT_STATUSES = ('TBC', 'CONFIRMED')
+
+
+def local_datetime(date, time_str):
+    """Combine YYYY-MM-DD and HH:MM into a local ISO 8601 date-time"""
+    if not DATE_RE.match(date):
+        raise ValueError(f"Invalid date '{date}' (expected YYYY-MM-DD)")
+    try:
+        datetime.date.fromisoformat(date)  # Range-checks month and day
+    except ValueError as e:
+        raise ValueError(f"Invalid date '{date}' ({e})") from None
+    time_match = TIME_RE.match(time_str)
+    if not time_match:
+        raise ValueError(f"Invalid time '{time_str}' (expected HH:MM)")
+    hour, minute = time_match.groups()
+    if int(hour) > 23 or int(minute) > 59:
+        raise ValueError(f"Invalid time '{time_str}' (hour 0-23, minute 0-59)")
+    return f"{date}T{int(hour):02d}:{minute}:00"
 
-def load_credentials(account):
-    """Load OAuth credentials for Google account"""
-    creds_path = get_credentials_path(account)
+
+def build_event(company, poc, event_type, date, start_time, end_time,
+                location, email_id, description=None, status="TBC"):
+    """Build the target calendar ID and event body based on status"""
     
-    if not creds_path:
-        print(f"Error: No credentials found for {account}")
-        print(f"Expected: {creds_path}")
-        return None
+    # Determine calendar based on status
+    if status.upper() == "TBC":
+        calendar_id = CALENDAR_ADMIN
+        color_id = "3"  # Purple
+        title_prefix = "TBC - "
+    else:
+        calendar_id = CALENDAR_MAIN
+        color_id = None  # Default
+        title_prefix = ""
     
-    try:
-        with open(creds_path, 'rb') as token:
-            creds = pickle.load(token)
-        
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-            with open(creds_path, 'wb') as token:
-                pickle.dump(creds, token)
-        
-        return creds
-    except Exception as e:
-        print(f"Error loading credentials: {e}")
-        return None
+    # Format title: [TBC - ]Company - POC (TYPE)
+    title = f"{title_prefix}{company} - {poc} ({event_type.upper()})"
+    
+    # Build description
+    desc_parts = []
+    if email_id:
+        desc_parts.append(f"Email ID: {email_id}")
+    if description:
+        desc_parts.append(description)
+    desc_parts.append(f"Status: {status}")
+    desc_parts.append(f"POC: {poc}")
+    
+    full_description = "\n\n".join(desc_parts)
+    
+    # Create event body
+    event_body = {
+        **BASE_EVENT_BODY,
+        'summary': title,
+        'location': location,
+        'description': full_description,
+        'start': {'dateTime': local_datetime(date, start_time), 'timeZone': TIMEZONE},
+        'end': {'dateTime': local_datetime(date, end_time), 'timeZone': TIMEZONE},
+    }
+    
+    if color_id:
+        event_body['colorId'] = color_id
+    
+    return calendar_id, event_body
+
+
+def event_result(event, calendar_id, event_body, status):
+    """Build the result dict for a created event"""
+    return {
+        'success': True,
+        'event_id': event.get('id'),
+        'calendar_id': calendar_id,
+        'title': event_body['summary'],
+        'html_link': event.get('htmlLink'),
+        'status': status
+    }
 
 
 def add_event(account, company, poc, event_type, date, start_time, end_time,
-              location, email_id, description=None, status="TBC"):
-    """Add event to appropriate calendar based on status"""
-    
-    creds = load_credentials(account)
-    if not creds:
-        return {'success': False, 'error': 'No credentials found'}
+              location, email_id, description=None, status="TBC", calendar_id=None):
+    """Add event to appropriate calendar based on status, or to calendar_id if given"""
     
     try:
-        service = build('calendar', 'v3', credentials=creds)
-        
-        # Determine calendar based on status
-        if status.upper() == "TBC":
-            calendar_id = CALENDAR_ADMIN
-            color_id = "3"  # Purple
-            title_prefix = "TBC - "
-        else:
-            calendar_id = CALENDAR_MAIN
-            color_id = None  # Default
-            title_prefix = ""
-        
-        # Format title: [TBC - ]Company - POC (TYPE)
-        title = f"{title_prefix}{company} - { POC} ({event_type.upper()})"
-        
-        # Build description
-        desc_parts = []
-        if email_id:
-            desc_parts.append(f"Email ID: {email_id}")
-        if description:
-            desc_parts.append(description)
-        desc_parts.append(f"Status: {status}")
-        desc_parts.append(f"POC: {poc}")
-        
-        full_description = "\n\n".join(desc_parts)
-        
-        # Parse date and times
-        date_obj = datetime.strptime(date, "%Y-%m-%d")
-        start_hour, start_min = map(int, start_time.split(":"))
-        end_hour, end_min = map(int, end_time.split(":"))
-        
-        start_dt = date_obj.replace(hour=start_hour, minute=start_min)
-        end_dt = date_obj.replace(hour=end_hour, minute=end_min)
+        service = _get_service(account, 'calendar', 'v3')
         
-        # Create event body
-        event_body = {
-            'summary': title,
-            'location': location,
-            'description': full_description,
-            'start': {
-                'dateTime': start_dt.isoformat(),
-                'timeZone': 'Asia/Singapore'
-            },
-            'end': {
-                'dateTime': end_dt.isoformat(),
-                'timeZone': 'Asia/Singapore'
-            },
-            'reminders': {
-                'useDefault': False,
-                'overrides': [
-                    {'method': 'email', 'minutes': 7 * 24 * 60},  # 1 week
-                    {'method': 'email', 'minutes': 3 * 24 * 60},  # 3 days
-                ]
-            }
-        }
-        
-        if color_id:
-            event_body['colorId'] = color_id
+        routed_id, event_body = build_event(
+            company, poc, event_type, date, start_time, end_time,
+            location, email_id, description, status
+        )
+        calendar_id = calendar_id or routed_id
         
         # Create event
-        event = service.events().insert(calendarId=calendar_id, body=event_body).execute()
+        event = service.events().insert(
+            calendarId=calendar_id, body=event_body, fields=EVENT_FIELDS
+        ).execute()
         
-        return {
-            'success': True,
-            'event_id': event.get('id'),
-            'calendar_id': calendar_id,
-            'title': title,
-            'html_link': event.get('htmlLink'),
-            'status': status
-        }
+        return event_result(event, calendar_id, event_body, status)
         
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 
+def add_events(account, rows, calendar_id=None):
+    """Add events from build_event kwargs rows via batched inserts, one result per row"""
+    
+    try:
+        service = _get_service(account, 'calendar', 'v3')
+    except Exception as e:
+        return [{'success': False, 'error': str(e)} for _ in rows]
+    
+    results = [None] * len(rows)
+    pending = {}
+    
+    def collect(request_id, response, exception):
+        index = int(request_id)
+        if exception:
+            results[index] = {'success': False, 'error': str(exception)}
+        else:
+            results[index] = event_result(response, *pending[index])
+    
+    numbered = enumerate(rows)
+    while True:
+        chunk = list(islice(numbered, BATCH_LIMIT))
+        if not chunk:
+            break
+        
+        batch = service.new_batch_http_request(callback=collect)
+        for index, row in chunk:
+            try:
+                routed_id, event_body = build_event(**row)
+            except Exception as e:
+                results[index] = {'success': False, 'error': str(e)}
+                continue
+            target_id = calendar_id or routed_id
+            pending[index] = (target_id, event_body, row.get('status', 'TBC'))
+            batch.add(service.events().insert(calendarId=target_id, body=event_body,
+                                              fields=EVENT_FIELDS),
+                      request_id=str(index))
+        
+        try:
+            batch.execute()
+        except Exception as e:
+            for index, _ in chunk:
+                if results[index] is None:
+                    results[index] = {'success': False, 'error': str(e)}
+    
+    return results
+
+
+def load_events_file(path):
+    """Read build_event keyword arguments from a JSONL file named like the CLI flags"""
+    # Rows are checked like the CLI flags; a bad row raises ValueError naming its line
+    rows = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            where = f"{path}:{lineno}"
+            try:
+                row = _loads(line)
+            except ValueError as e:
+                raise ValueError(f"{where}: invalid JSON ({e})") from None
+            if not isinstance(row, dict):
+                raise ValueError(f"{where}: expected a JSON object")
+            
+            missing = [key for key in EVENT_FILE_KEYS if not isinstance(row.get(key), str)]
+            if missing:
+                raise ValueError(f"{where}: missing or non-string {', '.join(missing)}")
+            for key in ('email_id', 'description'):
+                if row.get(key) is not None and not isinstance(row[key], str):
+                    raise ValueError(f"{where}: {key} must be a string")
+            if row['type'] not in EVENT_TYPES:
+                raise ValueError(f"{where}: type must be one of {', '.join(EVENT_TYPES)}")
+            if row.get('status', 'TBC') not in EVENT_STATUSES:
+                raise ValueError(f"{where}: status must be one of {', '.join(EVENT_STATUSES)}")
+            
+            rows.append({
+                'company': row['company'],
+                'poc': row['poc'],
+                'event_type': row['type'],
+                'date': row['date'],
+                'start_time': row['start'],
+                'end_time': row['end'],
+                'location': row['location'],
+                'email_id': row.get('email_id'),
+                'description': row.get('description'),
+                'status': row.get('status', 'TBC'),
+            })
+    return rows
+
+
+def print_result(result):
+    """Print a human-readable summary of one add_event result"""
+    if result.get('success'):
+        status_emoji = "🟣" if result['status'] == 'TBC' else "🔵"
+        sys.stdout.write(
+            f"{status_emoji} Event created successfully!\n"
+            f"   Title: {result['title']}\n"
+            f"   Calendar: {CALENDAR_NAMES.get(result['calendar_id'], result['calendar_id'])}\n"
+            f"   Link: {result['html_link']}\n"
+        )
+    else:
+        print(f"❌ Failed: {result.get('error')}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Add LiveMoments events to calendar (auto-routes by status)',
@@ -153,63 +270,99 @@ Examples:
   %(prog)s --company "Wedding" --poc "Sarah" --type LIVE \\
     --date 2026-07-15 --start 18:00 --end 22:00 \\
     --location "Hotel" --email-id "xyz789" --status CONFIRMED
+
+  # Many events in one batched request (one JSON object per line,
+  # keys named like the flags above: company, poc, type, date, ...)
+  %(prog)s --events-file shoot_days.jsonl
         """
     )
     
     parser.add_argument('--account', default=DEFAULT_ACCOUNT,
                         help='Google account to use')
-    parser.add_argument('--company', required=True,
+    parser.add_argument('--accounts',
+                        help="Comma-separated accounts to run concurrently, each adding to "
+                             "its own primary calendar (overrides --account)")
+    parser.add_argument('--company',
                         help='Company/client name')
-    parser.add_argument('--poc', required=True,
+    parser.add_argument('--poc',
                         help='Point of contact name')
-    parser.add_argument('--type', required=True, choices=['EVENT', 'LIVE'],
+    parser.add_argument('--type', choices=EVENT_TYPES,
                         help='EVENT=event coverage, LIVE=instant prints')
-    parser.add_argument('--date', required=True,
+    parser.add_argument('--date',
                         help='Event date (YYYY-MM-DD)')
-    parser.add_argument('--start', required=True,
+    parser.add_argument('--start',
                         help='Start time (HH:MM, 24-hour)')
-    parser.add_argument('--end', required=True,
+    parser.add_argument('--end',
                         help='End time (HH:MM, 24-hour)')
-    parser.add_argument('--location', required=True,
+    parser.add_argument('--location',
                         help='Event venue/location')
-    parser.add_argument('--email-id', required=True,
+    parser.add_argument('--email-id',
                         help='Gmail thread/message ID for traceability')
     parser.add_argument('--description',
                         help='Additional notes')
-    parser.add_argument('--status', default='TBC', choices=['TBC', 'CONFIRMED'],
+    parser.add_argument('--status', default='TBC', choices=EVENT_STATUSES,
                         help='TBC=Purple Admin calendar, CONFIRMED=Main calendar')
+    parser.add_argument('--events-file',
+                        help='JSONL file of events to add in one batch (replaces the event flags)')
     parser.add_argument('--json', action='store_true',
                         help='Output as JSON')
     
     args = parser.parse_args()
     
-    result = add_event(
-        args.account,
-        args.company,
-        args.poc,
-        args.type,
-        args.date,
-        args.start,
-        args.end,
-        args.location,
-        args.email_id,
-        args.description,
-        args.status
-    )
+    accounts = parse_accounts(args.accounts) if args.accounts else None
+    if args.accounts and not accounts:
+        parser.error('--accounts needs at least one account')
     
-    if args.json:
-        print(json.dumps(result, indent=2))
+    if args.events_file:
+        try:
+            rows = load_events_file(args.events_file)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        task, task_args = add_events, (rows,)
     else:
-        if result.get('success'):
-            status_emoji = "🟣" if result['status'] == 'TBC' else "🔵"
-            print(f"{status_emoji} Event created successfully!")
-            print(f"   Title: {result['title']}")
-            print(f"   Calendar: {'Administration (Purple)' if result['status'] == 'TBC' else 'Main'}")
-            print(f"   Link: {result['html_link']}")
-        else:
-            print(f"❌ Failed: {result.get('error')}")
+        missing = [f"--{name.replace('_', '-')}" for name in EVENT_FLAGS
+                   if getattr(args, name) is None]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
+        
+        task, task_args = add_event, (
+            args.company,
+            args.poc,
+            args.type,
+            args.date,
+            args.start,
+            args.end,
+            args.location,
+            args.email_id,
+            args.description,
+            args.status
+        )
+    
+    if accounts:
+        # The shared TBC/Main calendars would get one copy per account, so
+        # each account writes to its own primary calendar instead
+        results = dict(zip(accounts, run_many(accounts, task, *task_args,
+                                              calendar_id=CALENDAR_PRIMARY)))
+        per_account = results.items()
+    else:
+        results = task(args.account, *task_args)
+        per_account = [(args.account, results)]
+    
+    # --events-file yields a list of results per account, a single event one
+    outcomes = []
+    for account, result in per_account:
+        account_results = result if isinstance(result, list) else [result]
+        outcomes.extend(account_results)
+        if not args.json:
+            if accounts:
+                print(f"📅 {account}")
+            for r in account_results:
+                print_result(r)
+    
+    if args.json:
+        print(_dumps(results))
     
-    sys.exit(0 if result.get('success') else 1)
+    sys.exit(0 if all(r.get('success') for r in outcomes) else 1)
 
 
 if __name__ == '__main__':
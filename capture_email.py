@@ -4,128 +4,248 @@ Email Capture Tool - One-shot metadata extraction
 Saves email details for instant reference without re-searching
 """
 
-import os
+import sys
 import json
 import base64
 import argparse
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 
-# Gmail API imports
-try:
-    from google.auth.transport.requests import Request
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import InstalledAppFlow
-    from googleapiclient.discovery import build
-except ImportError:
-    print("Error: Google API libraries not installed")
-    print("Run: pip install google-auth google-auth-oauthlib google-auth-httplib2 google-api-python-client")
-    exit(1)
+from _google_common import _cached_service, _dumps, _loads, _save_token, _write_atomic
 
 # Gmail API scopes
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+# OAuth token and client secrets (relative to the working directory)
+TOKEN_PATH = Path('token.json')
+CREDENTIALS_PATH = Path('credentials.json')
+
+# Maximum body characters stored per email
+BODY_LIMIT = 5000
+
+# Headers kept when fetching with --headers-only
+METADATA_HEADERS = ['From', 'To', 'Cc', 'Bcc', 'Subject', 'Date', 'Message-ID']
+
+# Headers kept by extract_headers (lowercase)
+WANTED_HEADERS = frozenset({'from', 'to', 'cc', 'bcc', 'subject', 'date', 'message-id'})
+
+# Partial responses: only the fields capture_email reads
+LIST_FIELDS = 'messages(id,threadId),nextPageToken'
+MESSAGE_FIELDS = 'id,threadId,snippet,payload(mimeType,headers,body,parts)'
+
 # Cache file location
-CACHE_FILE = Path.home() / '.nanobot' / 'workspace' / 'skills' / 'gmail-checker-sender' / 'email_cache.json'
+CACHE_FILE = Path.home() / '.nanobot' / 'workspace' / 'skills' / 'gmail-checker-sender' / 'email_cache.jsonl'
 
 
 def get_credentials():
     """Get or refresh Gmail API credentials"""
+    # Gmail API imports are deferred so --help and --compact stay fast
+    try:
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+    except ImportError:
+        print("Error: Google API libraries not installed")
+        print("Run: pip install google-auth google-auth-oauthlib google-auth-httplib2 google-api-python-client")
+        exit(1)
+    
     creds = None
-    token_path = Path('token.json')
-    credentials_path = Path('credentials.json')
     
-    if token_path.exists():
-        creds = Credentials.from_authorized_user_file(str(token_path), SCOPES)
+    if TOKEN_PATH.exists():
+        creds = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
     
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
         else:
-            if not credentials_path.exists():
+            if not CREDENTIALS_PATH.exists():
                 print("Error: credentials.json not found")
                 print("Please download credentials from Google Cloud Console")
                 exit(1)
             flow = InstalledAppFlow.from_client_secrets_file(
-                str(credentials_path), SCOPES)
+                str(CREDENTIALS_PATH), SCOPES)
             creds = flow.run_local_server(port=0)
         
-        with open(token_path, 'w') as token:
-            token.write(creds.to_json())
+        _save_token(creds, TOKEN_PATH)
     
     return creds
 
 
-def decode_body(payload):
+@lru_cache(maxsize=8)
+def _load_service(api, version):
+    """Load credentials and build an API service once per process"""
+    creds = get_credentials()
+    return creds, _cached_service(api, version, creds)
+
+
+def _get_service(api, version):
+    """Get the process-wide service, refreshing expired credentials"""
+    creds, service = _load_service(api, version)
+    if creds.expired and creds.refresh_token:
+        from google.auth.transport.requests import Request
+        creds.refresh(Request())
+        _save_token(creds, TOKEN_PATH)
+    return service
+
+
+def decode_data(data, max_chars=None):
+    """Decode base64url body data, optionally to at most max_chars characters"""
+    if max_chars is not None:
+        # A character is at most 4 UTF-8 bytes, so only decode the base64
+        # prefix that can contain max_chars characters
+        max_bytes = max_chars * 4
+        data = data[:(max_bytes + 2) // 3 * 4] + '==='
+    text = base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
+    return text if max_chars is None else text[:max_chars]
+
+
+def decode_body(payload, max_chars=None):
     """Extract and decode email body from payload"""
-    body = ""
+    # Depth-first walk in document order; stop at the first text/plain part
+    # and only decode HTML if no plain text exists
+    html_data = None
+    stack = [payload]
     
-    if 'parts' in payload:
-        for part in payload['parts']:
-            mime_type = part.get('mimeType', '')
-            
-            if mime_type == 'text/plain' and 'data' in part.get('body', {}):
-                data = part['body']['data']
-                body = base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-                break
-            elif mime_type == 'text/html' and 'data' in part.get('body', {}):
-                # Store HTML but prefer plain text if available
-                if not body:
-                    data = part['body']['data']
-                    body = base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-            elif 'parts' in part:
-                # Recursive for nested parts
-                nested_body = decode_body(part)
-                if nested_body:
-                    body = nested_body
-                    break
-    elif 'data' in payload.get('body', {}):
-        data = payload['body']['data']
-        body = base64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
-    
-    return body
+    while stack:
+        part = stack.pop()
+        mime_type = part.get('mimeType', '')
+        data = part.get('body', {}).get('data')
+        
+        if data and mime_type == 'text/plain':
+            return decode_data(data, max_chars)
+        if data and mime_type == 'text/html' and html_data is None:
+            html_data = data
+        
+        stack.extend(reversed(part.get('parts', [])))
+    
+    # Single-part messages are decoded whatever their type
+    if html_data is None and 'parts' not in payload:
+        html_data = payload.get('body', {}).get('data')
+    
+    if not html_data:
+        return ""
+    return decode_data(html_data, max_chars)
 
 
 def extract_headers(headers):
     """Extract key headers into a dictionary"""
-    result = {}
-    for header in headers:
-        name = header.get('name', '').lower()
-        value = header.get('value', '')
-        if name in ['from', 'to', 'cc', 'bcc', 'subject', 'date', 'message-id']:
-            result[name] = value
-    return result
+    return {
+        header['name'].lower(): header.get('value', '')
+        for header in headers
+        if header.get('name', '').lower() in WANTED_HEADERS
+    }
+
+
+def _is_legacy_cache(path):
+    """Whether path holds the old pretty-printed JSON dict rather than JSONL"""
+    try:
+        with open(path, 'rb') as f:
+            first = f.readline().strip()
+    except OSError:
+        return False
+    # json.dump(indent=2) put the opening brace on a line of its own
+    return first in (b'{', b'{}')
+
+
+def _legacy_cache_lines(path):
+    """Convert a legacy JSON dict cache, plus any lines appended after it, to JSONL bytes"""
+    text = path.read_text(encoding='utf-8')
+    legacy, end = json.JSONDecoder().raw_decode(text)
+    lines = ''.join(_dumps({'key': key, **email}, indent=False) + '\n'
+                    for key, email in legacy.items() if isinstance(email, dict))
+    # Legacy entries are older than anything appended, so they go first
+    return (lines + text[end:].lstrip()).encode('utf-8')
+
+
+def migrate_json_cache(cache_file):
+    """One-shot import of legacy email_cache.json dicts into the JSONL cache"""
+    # --cache-path may name a legacy file itself: convert it in place before
+    # anything is appended (raises ValueError if it cannot be parsed)
+    if _is_legacy_cache(cache_file):
+        _write_atomic(cache_file, _legacy_cache_lines(cache_file))
+    
+    legacy_file = cache_file.with_suffix('.json')
+    if legacy_file == cache_file or not legacy_file.exists():
+        return
+    
+    try:
+        lines = _legacy_cache_lines(legacy_file)
+    except ValueError as e:
+        print(f"Error migrating {legacy_file}: {e}")
+        return
+    
+    existing = cache_file.read_bytes() if cache_file.exists() else b''
+    _write_atomic(cache_file, lines + existing)
+    legacy_file.rename(legacy_file.with_name(legacy_file.name + '.migrated'))
 
 
-def capture_email(service, query, save=False, json_output=False, cache_path=None):
+def compact_cache(cache_file):
+    """Rewrite the append-only cache keeping only the latest entry per key"""
+    entries = {}
+    with open(cache_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                email = _loads(line)
+                entries[email['key']] = email
+            except (ValueError, TypeError, KeyError):
+                continue  # Skip a torn, corrupt or non-entry line
+    
+    lines = ''.join(_dumps(email, indent=False) + '\n' for email in entries.values())
+    _write_atomic(cache_file, lines.encode('utf-8'))
+    return len(entries)
+
+
+def capture_email(service, query, save=False, json_output=False, cache_path=None,
+                  headers_only=False):
     """Capture email metadata in one shot"""
     # Use provided cache path or default
     cache_file = cache_path if cache_path else CACHE_FILE
     
     # Search for emails
-    results = service.users().messages().list(userId='me', q=query, maxResults=5).execute()
+    results = service.users().messages().list(
+        userId='me', q=query, maxResults=5, fields=LIST_FIELDS
+    ).execute()
     messages = results.get('messages', [])
     
     if not messages:
         print(f"No emails found for query: {query}")
         return None
     
+    # Fetch message details in a single batched round-trip; headers-only
+    # skips the MIME tree (and any attachments) entirely
+    if headers_only:
+        get_params = {'format': 'metadata', 'metadataHeaders': METADATA_HEADERS}
+    else:
+        get_params = {'format': 'full'}
+    
+    fetched = {}
+    
+    def collect(request_id, response, exception):
+        fetched[request_id] = (response, exception)
+    
+    batch = service.new_batch_http_request(callback=collect)
+    for msg_meta in messages:
+        batch.add(
+            service.users().messages().get(userId='me', id=msg_meta['id'],
+                                           fields=MESSAGE_FIELDS, **get_params),
+            request_id=msg_meta['id']
+        )
+    batch.execute()
+    
     captured = []
     
     for msg_meta in messages:
         msg_id = msg_meta['id']
         thread_id = msg_meta['threadId']
         
-        # Get full message details
-        msg = service.users().messages().get(
-            userId='me', 
-            id=msg_id,
-            format='full'
-        ).execute()
+        msg, exception = fetched[msg_id]
+        if exception:
+            raise exception
         
         payload = msg.get('payload', {})
         headers = extract_headers(payload.get('headers', []))
-        body = decode_body(payload)
+        body = '' if headers_only else decode_body(payload, BODY_LIMIT)
         
         # Build capture object
         email_data = {
@@ -138,7 +258,7 @@ def capture_email(service, query, save=False, json_output=False, cache_path=None
             'bcc': headers.get('bcc', ''),
             'subject': headers.get('subject', ''),
             'date': headers.get('date', ''),
-            'body': body[:5000] if body else '',  # Limit body size
+            'body': body,
             'search_query': query,
             'snippet': msg.get('snippet', '')
         }
@@ -147,46 +267,46 @@ def capture_email(service, query, save=False, json_output=False, cache_path=None
     
     # Save to cache if requested
     if save:
-        cache_data = {}
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r') as f:
-                    cache_data = json.load(f)
-            except:
-                cache_data = {}
-        
-        # Add new captures with timestamp key
-        for email in captured:
-            key = f"{email['thread_id']}_{email['message_id'][:8]}"
-            cache_data[key] = email
-        
         # Ensure directory exists
         cache_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(cache_file, 'w') as f:
-            json.dump(cache_data, f, indent=2)
-        
-        if not json_output:
-            print(f"✓ Saved {len(captured)} email(s) to cache: {cache_file}")
+        try:
+            migrate_json_cache(cache_file)
+        except ValueError as e:
+            # Appending JSONL to an unreadable legacy dict would corrupt it
+            print(f"Error: not saving, {cache_file} is a legacy cache that could not be "
+                  f"converted ({e})", file=sys.stderr)
+        else:
+            # Append one line per capture; later lines win on --compact
+            with open(cache_file, 'a', encoding='utf-8') as f:
+                for email in captured:
+                    key = f"{email['thread_id']}_{email['message_id'][:8]}"
+                    f.write(_dumps({'key': key, **email}, indent=False) + '\n')
+            
+            if not json_output:
+                print(f"✓ Saved {len(captured)} email(s) to cache: {cache_file}")
     
     # Output results
     if json_output:
-        print(json.dumps(captured, indent=2))
+        print(_dumps(captured))
     else:
-        # Pretty print summary
+        # Pretty print summary in a single write
+        lines = []
         for i, email in enumerate(captured, 1):
-            print(f"\n{'='*60}")
-            print(f"EMAIL #{i}")
-            print(f"{'='*60}")
-            print(f"Thread ID:  {email['thread_id']}")
-            print(f"Message ID: {email['message_id']}")
-            print(f"From:       {email['from']}")
-            print(f"To:         {email['to']}")
-            print(f"CC:         {email['cc'] or '(none)'}")
-            print(f"Subject:    {email['subject']}")
-            print(f"Date:       {email['date']}")
-            print(f"\nBody Preview (first 500 chars):")
-            print(f"{email['body'][:500]}...")
+            lines += [
+                f"\n{'='*60}",
+                f"EMAIL #{i}",
+                f"{'='*60}",
+                f"Thread ID:  {email['thread_id']}",
+                f"Message ID: {email['message_id']}",
+                f"From:       {email['from']}",
+                f"To:         {email['to']}",
+                f"CC:         {email['cc'] or '(none)'}",
+                f"Subject:    {email['subject']}",
+                f"Date:       {email['date']}",
+                f"\nBody Preview (first 500 chars):",
+                f"{email['body'][:500]}...",
+            ]
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     return captured
 
@@ -200,27 +320,51 @@ Examples:
   %(prog)s --query "from:jean subject:quotation" --save
   %(prog)s --query "from:altissimostudios subject:Test" --json
   %(prog)s --query "in:inbox is:unread" --save --json
+  %(prog)s --compact
         """
     )
     
-    parser.add_argument('--query', '-q', required=True,
+    parser.add_argument('--query', '-q',
                         help='Gmail search query (same as Gmail search bar)')
     parser.add_argument('--save', '-s', action='store_true',
                         help='Save captured emails to cache file')
     parser.add_argument('--json', '-j', action='store_true',
                         help='Output as JSON')
+    parser.add_argument('--headers-only', action='store_true',
+                        help='Fetch headers and snippet only (skips the body)')
+    parser.add_argument('--compact', action='store_true',
+                        help='Drop superseded entries from the cache file')
     parser.add_argument('--cache-path', 
                         help=f'Custom cache file path (default: {CACHE_FILE})')
     
     args = parser.parse_args()
     
+    if not args.query and not args.compact:
+        parser.error('--query is required unless --compact is given')
+    
+    cache_path = Path(args.cache_path) if args.cache_path else None
+    
+    if args.compact:
+        cache_file = cache_path if cache_path else CACHE_FILE
+        try:
+            migrate_json_cache(cache_file)
+        except ValueError as e:
+            print(f"Error: {cache_file} is a legacy cache that could not be converted ({e})")
+            sys.exit(1)
+        if cache_file.exists():
+            kept = compact_cache(cache_file)
+            print(f"✓ Compacted cache to {kept} email(s): {cache_file}")
+        else:
+            print(f"No cache file to compact: {cache_file}")
+        if not args.query:
+            return
+    
     # Get credentials and build service
-    creds = get_credentials()
-    service = build('gmail', 'v1', credentials=creds)
+    service = _get_service('gmail', 'v1')
     
     # Capture emails
-    cache_path = Path(args.cache_path) if args.cache_path else None
-    capture_email(service, args.query, save=args.save, json_output=args.json, cache_path=cache_path)
+    capture_email(service, args.query, save=args.save, json_output=args.json,
+                  cache_path=cache_path, headers_only=args.headers_only)
 
 
 if __name__ == '__main__':
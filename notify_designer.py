@@ -9,71 +9,29 @@ booking is confirmed, so she can coordinate overlay design directly with client.
 
 import os
 import sys
-import json
-import pickle
+import html
 import base64
 import argparse
 from pathlib import Path
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.message import EmailMessage
 
-# Activate virtual environment if running directly
-venv_path = Path(__file__).parent / "venv"
-if venv_path.exists():
-    site_packages = list(venv_path.glob("lib/python*/site-packages"))
-    if site_packages:
-        sys.path.insert(0, str(site_packages[0]))
+# Activate virtual environment if running directly; skipped when a host
+# process already loaded the Google libraries or sets NANOBOT_SKIP_VENV
+if 'NANOBOT_SKIP_VENV' not in os.environ and 'google' not in sys.modules:
+    venv_path = Path(__file__).parent / "venv"
+    if venv_path.exists():
+        site_packages = list(venv_path.glob("lib/python*/site-packages"))
+        if site_packages:
+            sys.path.insert(0, str(site_packages[0]))
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from _google_common import _dumps, _get_service
 
 DEFAULT_ACCOUNT = "livemomentssg@gmail.com"
 DESIGNER_EMAIL = "designer@livemoments.com.sg"
 FROM_ADDRESS = "hello@livemoments.com.sg"
 
-
-def get_credentials_path(account):
-    """Get path to OAuth token for account"""
-    base_path = Path.home() / ".nanobot" / "credentials" / "gmail"
-    token_file = base_path / f"{account.replace('@', '_at_')}.token"
-    
-    if not token_file.exists():
-        alt_path = Path.home() / ".nanobot" / "credentials" / f"{account}.json"
-        if alt_path.exists():
-            return alt_path
-    
-    return token_file if token_file.exists() else None
-
-
-def load_credentials(account):
-    """Load OAuth credentials for Gmail account"""
-    creds_path = get_credentials_path(account)
-    
-    if not creds_path:
-        return None
-    
-    try:
-        with open(creds_path, 'rb') as token:
-            creds = pickle.load(token)
-        
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-            with open(creds_path, 'wb') as token:
-                pickle.dump(creds, token)
-        
-        return creds
-    except Exception as e:
-        print(f"Error loading credentials for {account}: {e}", file=sys.stderr)
-        return None
-
-
-def build_designer_email(client, poc, poc_email, date, time, venue, event_type):
-    """Build the designer notification email body"""
-    
-    subject = f"New Booking - {client} - {date}"
-    
-    body = f"""Hi Ting Ting,
+# Designer notification body; the HTML variant is derived once at import
+BODY_TEMPLATE = """Hi Ting Ting,
 
 We have a new instant print booking confirmed.
 
@@ -87,8 +45,20 @@ Venue: {venue}
 Event Type: {event_type}
 
 Thank you!"""
+HTML_TEMPLATE = BODY_TEMPLATE.replace('\n', '<br>')
+
+
+def build_designer_email(client, poc, poc_email, date, time, venue, event_type):
+    """Build the designer notification subject, plain text and HTML bodies"""
+    
+    subject = f"New Booking - {client} - {date}"
+    
+    fields = {'poc': poc, 'poc_email': poc_email, 'date': date, 'time': time,
+              'venue': venue, 'event_type': event_type}
+    body = BODY_TEMPLATE.format(**fields)
+    html_body = HTML_TEMPLATE.format(**{k: html.escape(v) for k, v in fields.items()})
     
-    return subject, body
+    return subject, body, html_body
 
 
 def preview_email(to, subject, body, sender):
@@ -110,19 +80,12 @@ def send_designer_notification(account, client, poc, poc_email, date, time,
                                 draft=False):
     """Send notification to designer for Instant Print booking"""
     
-    creds = load_credentials(account)
-    if not creds:
-        return {
-            'success': False,
-            'error': f'No credentials found for {account}. Run OAuth setup first.'
-        }
-    
     try:
-        service = build('gmail', 'v1', credentials=creds)
+        service = _get_service(account, 'gmail', 'v1')
         
         # Build email content
-        subject, body = build_designer_email(client, poc, poc_email, date, 
-                                              time, venue, event_type)
+        subject, body, html_body = build_designer_email(client, poc, poc_email, date,
+                                                         time, venue, event_type)
         
         # Show preview
         if not auto_confirm:
@@ -137,23 +100,15 @@ def send_designer_notification(account, client, poc, poc_email, date, time,
                     'preview_only': True
                 }
         
-        # Create MIME message
-        message = MIMEMultipart('alternative')
-        message['to'] = DESIGNER_EMAIL
-        message['from'] = FROM_ADDRESS
-        message['subject'] = subject
+        # Create message with plain text and HTML alternatives
+        message = EmailMessage()
+        message['To'] = DESIGNER_EMAIL
+        message['From'] = FROM_ADDRESS
+        message['Subject'] = subject
+        message.set_content(body)
+        message.add_alternative(html_body, subtype='html')
         
-        # Add body as HTML and plain text
-        plain_text = body
-        html_body = body.replace('\n', '<br>')
-        
-        msg_plain = MIMEText(plain_text, 'plain')
-        msg_html = MIMEText(html_body, 'html')
-        
-        message.attach(msg_plain)
-        message.attach(msg_html)
-        
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+        raw = base64.urlsafe_b64encode(bytes(message)).decode('ascii')
         msg_body = {'raw': raw}
         
         if draft:
@@ -189,6 +144,24 @@ def send_designer_notification(account, client, poc, poc_email, date, time,
         }
 
 
+def print_result(result):
+    """Print a human-readable summary of one notification result"""
+    if result.get('success'):
+        if result.get('is_draft'):
+            print(f"✅ Designer notification saved as draft!")
+            print(f"   Draft ID: {result.get('draft_id')}")
+        else:
+            print(f"✅ Designer notification sent successfully!")
+            print(f"   Message ID: {result.get('message_id')}")
+        print(f"   Designer: {result.get('to')}")
+        print(f"   Client: {result.get('client')} ({result.get('poc')})")
+        print(f"   Subject: {result.get('subject')}")
+    elif result.get('preview_only'):
+        print("📋 Preview shown. Notification not sent.")
+    else:
+        print(f"❌ Failed: {result.get('error')}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Notify designer for Instant Print booking'
@@ -234,22 +207,9 @@ def main():
     
     # Output result
     if args.json:
-        print(json.dumps(result, indent=2))
+        print(_dumps(result))
     else:
-        if result.get('success'):
-            if result.get('is_draft'):
-                print(f"✅ Designer notification saved as draft!")
-                print(f"   Draft ID: {result.get('draft_id')}")
-            else:
-                print(f"✅ Designer notification sent successfully!")
-                print(f"   Message ID: {result.get('message_id')}")
-            print(f"   Designer: {result.get('to')}")
-            print(f"   Client: {result.get('client')} ({result.get('poc')})")
-            print(f"   Subject: {result.get('subject')}")
-        elif result.get('preview_only'):
-            print("📋 Preview shown. Notification not sent.")
-        else:
-            print(f"❌ Failed: {result.get('error')}")
+        print_result(result)
     
     sys.exit(0 if result.get('success') else 1)
 
@@ -10,65 +10,142 @@ Features:
 - CC/BCC
 - Save as draft
 - Preview before send (safety)
+- Bulk sends from a JSONL recipients file
 """
 
+import io
 import os
 import sys
-import json
-import pickle
-import base64
+import secrets
 import argparse
+import threading
+from base64 import encodebytes
 from pathlib import Path
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from functools import lru_cache
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from email.header import Header
+from email.utils import formataddr, getaddresses
 
-# Activate virtual environment if running directly
-venv_path = Path(__file__).parent / "venv"
-if venv_path.exists():
-    site_packages = list(venv_path.glob("lib/python*/site-packages"))
-    if site_packages:
-        sys.path.insert(0, str(site_packages[0]))
+# Activate virtual environment if running directly; skipped when a host
+# process already loaded the Google libraries or sets NANOBOT_SKIP_VENV
+if 'NANOBOT_SKIP_VENV' not in os.environ and 'google' not in sys.modules:
+    venv_path = Path(__file__).parent / "venv"
+    if venv_path.exists():
+        site_packages = list(venv_path.glob("lib/python*/site-packages"))
+        if site_packages:
+            sys.path.insert(0, str(site_packages[0]))
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from _google_common import (HTTP_TIMEOUT, _dumps, _loads, _save_token, get_credentials_path,
+                            load_credentials)
+
+# SIMD-accelerated base64 when pybase64 is installed
+try:
+    from pybase64 import urlsafe_b64encode
+except ImportError:
+    from base64 import urlsafe_b64encode
 
 DEFAULT_ACCOUNT = "livemomentssg@gmail.com"
 
+# Gmail accepts at most 100 calls per batch request
+BATCH_LIMIT = 100
 
-def get_credentials_path(account):
-    """Get path to OAuth token for account"""
-    base_path = Path.home() / ".nanobot" / "credentials" / "gmail"
-    token_file = base_path / f"{account.replace('@', '_at_')}.token"
-    
-    if not token_file.exists():
-        alt_path = Path.home() / ".nanobot" / "credentials" / f"{account}.json"
-        if alt_path.exists():
-            return alt_path
+# RFC 5322 line limit; longer lines force a part to base64
+MAX_LINE_OCTETS = 998
+
+# Longest header value that fits on one line after any header name we write
+MAX_HEADER_VALUE = MAX_LINE_OCTETS - len('References: ')
+
+# Refresh tokens in the background once they are this close to expiry
+REFRESH_MARGIN = 5 * 60  # Seconds
+
+_refresh_executor = ThreadPoolExecutor(max_workers=1)
+_refresh_lock = threading.Lock()
+
+# Per-thread Gmail services (httplib2 connections are not thread-safe)
+_thread_state = threading.local()
+
+
+def _expires_soon(creds):
+    """Whether credentials expire within REFRESH_MARGIN (expiry is naive UTC)"""
+    if not creds.expiry:
+        return False
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return (creds.expiry - now).total_seconds() < REFRESH_MARGIN
+
+
+def _do_refresh(account, creds):
+    """Refresh credentials and persist them, unless another refresh got there first"""
+    from google.auth.transport.requests import Request
     
-    return token_file if token_file.exists() else None
+    with _refresh_lock:
+        if not _expires_soon(creds):
+            return
+        try:
+            creds.refresh(Request())
+            _save_token(creds, get_credentials_path(account))
+        except Exception as e:
+            print(f"Error refreshing credentials for {account}: {e}", file=sys.stderr)
+
 
+@lru_cache(maxsize=8)
+def _load_creds(account):
+    """Load credentials once per process, shared by every thread's service"""
+    # Raises rather than returning None, so a failed load is not cached
+    creds = load_credentials(account)
+    if not creds:
+        raise RuntimeError(f'No credentials found for {account}. Run OAuth setup first.')
+    return creds
 
-def load_credentials(account):
-    """Load OAuth credentials for Gmail account"""
-    creds_path = get_credentials_path(account)
+
+def _load_service(account):
+    """Build the Gmail service once per thread, on top of the shared credentials"""
+    services = getattr(_thread_state, 'services', None)
+    if services is None:
+        services = _thread_state.services = {}
+    if account in services:
+        return services[account]
     
-    if not creds_path:
-        return None
+    import httplib2
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.discovery import build
     
-    try:
-        with open(creds_path, 'rb') as token:
-            creds = pickle.load(token)
-        
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-            with open(creds_path, 'wb') as token:
-                pickle.dump(creds, token)
+    creds = _load_creds(account)
+    # One persistent connection per service, reused across sends
+    http = AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+    # Bundled discovery document: no HTTP fetch and no discovery cache lookup
+    service = build('gmail', 'v1', http=http,
+                    cache_discovery=False, static_discovery=True)
+    services[account] = (creds, service)
+    return services[account]
+
+
+def _get_service(account):
+    """Get this thread's Gmail service for account, refreshing expired credentials"""
+    creds, service = _load_service(account)
+    if not creds.refresh_token:
+        return service
+    
+    if creds.expired:
+        from google.auth.transport.requests import Request
         
-        return creds
-    except Exception as e:
-        print(f"Error loading credentials for {account}: {e}", file=sys.stderr)
-        return None
+        # Already expired: the next call needs a fresh token, so block
+        with _refresh_lock:
+            if creds.expired:
+                creds.refresh(Request())
+                _save_token(creds, get_credentials_path(account))
+    elif _expires_soon(creds):
+        # Still valid: refresh off the critical path before it lapses
+        _refresh_executor.submit(_do_refresh, account, creds)
+    
+    return service
+
+
+@lru_cache(maxsize=8)
+def _resolve_sender(account):
+    """Look up the account's own email address once per process"""
+    profile = _get_service(account).users().getProfile(userId='me').execute()
+    return profile.get('emailAddress', account)
 
 
 def preview_email(to, subject, body, cc=None, bcc=None, sender=None):
@@ -85,31 +162,124 @@ def preview_email(to, subject, body, cc=None, bcc=None, sender=None):
         print(f"Bcc: {bcc}")
     print(f"Subject: {subject}")
     print("-"*70)
-    print(body)
+    print(body.decode('utf-8', errors='replace') if isinstance(body, bytes) else body)
     print("="*70)
     print()
 
 
+def _encode_header(value):
+    """RFC 2047-encode a header value unless it is plain ASCII"""
+    if value.isascii():
+        return value
+    return Header(value, 'utf-8').encode()
+
+
+def _encode_addresses(value):
+    """RFC 2047-encode non-ASCII display names in an address list, folding long lists"""
+    if value.isascii() and len(value) <= MAX_HEADER_VALUE:
+        return value
+    addresses = [formataddr(pair, 'utf-8') for pair in getaddresses([value])]
+    joined = ', '.join(addresses)
+    if len(joined) <= MAX_HEADER_VALUE:
+        return joined
+    # Fold after each comma so every line stays within the limit
+    return ',\n '.join(addresses)
+
+
+def _fold_words(value):
+    """Fold a whitespace-separated header value (e.g. References) when too long"""
+    if len(value) <= MAX_HEADER_VALUE:
+        return value
+    return '\n '.join(value.split())
+
+
+def _raw_b64(payload):
+    """Encode raw message bytes for the Gmail API 'raw' field"""
+    # memoryview lets the encoder read the buffer without copying it
+    return urlsafe_b64encode(memoryview(payload)).decode('ascii')
+
+
+def _body_to_html(body):
+    """Render a UTF-8 plain text body as escaped HTML bytes with <br> line breaks"""
+    # Escaping bytes is safe: UTF-8 multi-byte sequences never contain ASCII bytes
+    escaped = body.replace(b'&', b'&amp;').replace(b'<', b'&lt;').replace(b'>', b'&gt;')
+    if b'\n' not in escaped:
+        return escaped
+    # Keep the newline after <br> so the part's lines stay short
+    return escaped.replace(b'\n', b'<br>\n')
+
+
+def _has_long_line(payload):
+    """Whether any line of payload is longer than an 8bit MIME part allows"""
+    start = 0
+    while start + MAX_LINE_OCTETS < len(payload):
+        end = payload.find(b'\n', start, start + MAX_LINE_OCTETS + 1)
+        if end == -1:
+            return True
+        start = end + 1
+    return False
+
+
+def _build_raw(to, sender, subject, body, cc=None, bcc=None, in_reply_to=None,
+               references=None):
+    """Build the RFC 2822 bytes (as a memoryview) for a plain text + HTML email"""
+    # Assembled directly rather than through email.mime: this fixed two-part
+    # shape needs no charset detection or re-encoding, and only address
+    # lists and References can grow long enough to need folding
+    
+    # A line break in a value would start a new header (e.g. a hidden Bcc)
+    for name, value in (('To', to), ('From', sender), ('Subject', subject), ('Cc', cc),
+                        ('Bcc', bcc), ('In-Reply-To', in_reply_to), ('References', references)):
+        if value and ('\r' in value or '\n' in value):
+            raise ValueError(f"{name} header must not contain line breaks")
+    
+    boundary = secrets.token_hex(16)
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    # Same newline translation as a text-mode read, for every caller
+    if b'\r' in body:
+        body = body.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    
+    headers = [
+        ('To', _encode_addresses(to)),
+        ('From', _encode_addresses(sender)),
+        ('Subject', _encode_header(subject)),
+    ]
+    if in_reply_to:
+        headers.append(('In-Reply-To', in_reply_to))
+        headers.append(('References', _fold_words(references or in_reply_to)))
+    if cc:
+        headers.append(('Cc', _encode_addresses(cc)))
+    if bcc:
+        headers.append(('Bcc', _encode_addresses(bcc)))
+    headers.append(('MIME-Version', '1.0'))
+    headers.append(('Content-Type', f'multipart/alternative; boundary="{boundary}"'))
+    
+    buf = io.BytesIO()
+    buf.write(''.join(f"{name}: {value}\n" for name, value in headers).encode('ascii'))
+    
+    # Add body as plain text and HTML, sent as raw UTF-8 unless a line is too long
+    for subtype, payload in (('plain', body), ('html', _body_to_html(body))):
+        encoding = 'base64' if _has_long_line(payload) else '8bit'
+        buf.write(f"\n--{boundary}\n"
+                  f"Content-Type: text/{subtype}; charset=utf-8\n"
+                  f"Content-Transfer-Encoding: {encoding}\n\n".encode('ascii'))
+        buf.write(encodebytes(payload) if encoding == 'base64' else payload)
+        buf.write(b'\n')
+    buf.write(f"\n--{boundary}--\n".encode('ascii'))
+    
+    return buf.getbuffer()
+
+
 def send_email(account, to, subject, body, cc=None, bcc=None, auto_confirm=False,
                from_address=None, draft=False, thread_id=None):
     """Send email using Gmail API"""
     
-    creds = load_credentials(account)
-    if not creds:
-        return {
-            'success': False,
-            'error': f'No credentials found for {account}. Run OAuth setup first.'
-        }
-    
     try:
-        service = build('gmail', 'v1', credentials=creds)
+        service = _get_service(account)
         
         # Get sender email (use override if provided)
-        if from_address:
-            sender = from_address
-        else:
-            profile = service.users().getProfile(userId='me').execute()
-            sender = profile.get('emailAddress', account)
+        sender = from_address or _resolve_sender(account)
         
         # Show preview
         if not auto_confirm:
@@ -124,28 +294,7 @@ def send_email(account, to, subject, body, cc=None, bcc=None, auto_confirm=False
                     'preview_only': True
                 }
         
-        # Create MIME message
-        message = MIMEMultipart('alternative')
-        message['to'] = to
-        message['from'] = sender
-        message['subject'] = subject
-        
-        if cc:
-            message['cc'] = cc
-        if bcc:
-            message['bcc'] = bcc
-        
-        # Add body as HTML and plain text
-        plain_text = body
-        html_body = body.replace('\n', '<br>')
-        
-        msg_plain = MIMEText(plain_text, 'plain')
-        msg_html = MIMEText(html_body, 'html')
-        
-        message.attach(msg_plain)
-        message.attach(msg_html)
-        
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+        raw = _raw_b64(_build_raw(to, sender, subject, body, cc, bcc))
         msg_body = {'raw': raw}
         
         if thread_id:
@@ -181,51 +330,37 @@ def send_email(account, to, subject, body, cc=None, bcc=None, auto_confirm=False
 
 
 def send_reply(account, thread_id, to, subject, body, cc=None, auto_confirm=False,
-               from_address=None, draft=False):
+               from_address=None, draft=False, in_reply_to_msgid=None):
     """Send a reply to an existing thread"""
     
-    creds = load_credentials(account)
-    if not creds:
-        return {
-            'success': False,
-            'error': f'No credentials found for {account}'
-        }
-    
     try:
-        service = build('gmail', 'v1', credentials=creds)
+        service = _get_service(account)
         
-        # Get sender email
-        if from_address:
-            sender = from_address
-        else:
-            profile = service.users().getProfile(userId='me').execute()
-            sender = profile.get('emailAddress', account)
+        # Get sender email (shared per-account cache with send_email)
+        sender = from_address or _resolve_sender(account)
         
-        # Get thread to set references
-        thread = service.users().threads().get(userId='me', id=thread_id).execute()
-        original_msg_id = thread['messages'][-1]['id']
+        # Reply to the latest message's RFC 822 Message-ID; fetch only its
+        # threading headers unless the caller already knows it
+        if in_reply_to_msgid:
+            in_reply_to = references = in_reply_to_msgid
+        else:
+            thread = service.users().threads().get(
+                userId='me', id=thread_id, format='metadata',
+                metadataHeaders=['Message-ID', 'References'],
+                fields='messages/payload/headers'
+            ).execute()
+            headers = {
+                header['name'].lower(): header['value']
+                for header in thread['messages'][-1]['payload'].get('headers', [])
+            }
+            in_reply_to = headers.get('message-id')
+            references = ' '.join(filter(None, [headers.get('references'), in_reply_to]))
         
         # Create message with thread reference
-        message = MIMEMultipart('alternative')
-        message['to'] = to
-        message['from'] = sender
-        message['subject'] = f"Re: {subject.replace('Re: ', '')}"
-        message['In-Reply-To'] = original_msg_id
-        message['References'] = original_msg_id
-        
-        if cc:
-            message['cc'] = cc
-        
-        plain_text = body
-        html_body = body.replace('\n', '<br>')
-        
-        msg_plain = MIMEText(plain_text, 'plain')
-        msg_html = MIMEText(html_body, 'html')
-        
-        message.attach(msg_plain)
-        message.attach(msg_html)
-        
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+        raw = _raw_b64(_build_raw(
+            to, sender, f"Re: {subject.replace('Re: ', '')}", body, cc,
+            in_reply_to=in_reply_to, references=references
+        ))
         
         if not auto_confirm:
             preview_email(to, subject, body, cc, None, sender)
@@ -272,11 +407,174 @@ def send_reply(account, thread_id, to, subject, body, cc=None, auto_confirm=Fals
         }
 
 
+def send_emails_bulk(account, messages, from_address=None, draft=False):
+    """Send (or save as drafts) many emails via batched requests
+    
+    Each message is a dict with 'to', 'subject', 'body' and optional 'cc',
+    'bcc' and 'thread_id'. Returns one send_email-style result per message,
+    in the same order.
+    """
+    
+    try:
+        service = _get_service(account)
+        sender = from_address or _resolve_sender(account)
+    except Exception as e:
+        return [{'success': False, 'error': str(e)} for _ in messages]
+    
+    results = [None] * len(messages)
+    
+    def collect(request_id, response, exception):
+        index = int(request_id)
+        msg = messages[index]
+        if exception:
+            results[index] = {'success': False, 'error': str(exception)}
+        elif draft:
+            results[index] = {
+                'success': True,
+                'draft_id': response.get('id'),
+                'sender': sender,
+                'to': msg['to'],
+                'subject': msg['subject'],
+                'is_draft': True
+            }
+        else:
+            results[index] = {
+                'success': True,
+                'message_id': response.get('id'),
+                'thread_id': response.get('threadId'),
+                'sender': sender,
+                'to': msg['to'],
+                'subject': msg['subject']
+            }
+    
+    for start in range(0, len(messages), BATCH_LIMIT):
+        chunk = range(start, min(start + BATCH_LIMIT, len(messages)))
+        batch = service.new_batch_http_request(callback=collect)
+        
+        for index in chunk:
+            msg = messages[index]
+            try:
+                raw = _raw_b64(_build_raw(
+                    msg['to'], sender, msg['subject'], msg['body'],
+                    msg.get('cc'), msg.get('bcc')
+                ))
+            except Exception as e:
+                results[index] = {'success': False, 'error': str(e)}
+                continue
+            msg_body = {'raw': raw}
+            if msg.get('thread_id'):
+                msg_body['threadId'] = msg['thread_id']
+            
+            if draft:
+                request = service.users().drafts().create(userId='me', body={'message': msg_body})
+            else:
+                request = service.users().messages().send(userId='me', body=msg_body)
+            batch.add(request, request_id=str(index))
+        
+        try:
+            batch.execute()
+        except Exception as e:
+            for index in chunk:
+                if results[index] is None:
+                    results[index] = {'success': False, 'error': str(e)}
+    
+    return results
+
+
+def send_emails_parallel(account, messages, max_workers, from_address=None, draft=False):
+    """Send messages as individual requests across max_workers threads
+    
+    Takes the same message dicts as send_emails_bulk and returns one
+    send_email result per message, in the same order.
+    """
+    if not messages:
+        return []
+    
+    # Load credentials and resolve the sender up front so the workers share them
+    try:
+        _get_service(account)
+        sender = from_address or _resolve_sender(account)
+    except Exception as e:
+        return [{'success': False, 'error': str(e)} for _ in messages]
+    
+    # Each worker thread builds its own service and connection on first use
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(messages))) as executor:
+        futures = [
+            executor.submit(send_email, account, auto_confirm=True,
+                            from_address=sender, draft=draft, **msg)
+            for msg in messages
+        ]
+        return [future.result() for future in futures]
+
+
+def load_recipients_file(path):
+    """Read send_email keyword arguments from a JSONL file (to, subject, body, cc, bcc, thread_id)"""
+    # Rows are type-checked here; a bad row raises ValueError naming its line
+    messages = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            where = f"{path}:{lineno}"
+            try:
+                row = _loads(line)
+            except ValueError as e:
+                raise ValueError(f"{where}: invalid JSON ({e})") from None
+            if not isinstance(row, dict):
+                raise ValueError(f"{where}: expected a JSON object")
+            
+            missing = [key for key in ('to', 'subject') if not isinstance(row.get(key), str)]
+            if missing:
+                raise ValueError(f"{where}: missing or non-string {', '.join(missing)}")
+            for key in ('body', 'cc', 'bcc', 'thread_id'):
+                if row.get(key) is not None and not isinstance(row[key], str):
+                    raise ValueError(f"{where}: {key} must be a string")
+            
+            messages.append({
+                'to': row['to'],
+                'subject': row['subject'],
+                'body': row.get('body') or '',
+                'cc': row.get('cc'),
+                'bcc': row.get('bcc'),
+                'thread_id': row.get('thread_id'),
+            })
+    return messages
+
+
+def print_result(result):
+    """Print a human-readable summary of one send result"""
+    if result.get('success'):
+        if result.get('is_draft'):
+            print(f"✅ Draft saved successfully!")
+            print(f"   Draft ID: {result.get('draft_id')}")
+        else:
+            print(f"✅ Email sent successfully!")
+            print(f"   Message ID: {result.get('message_id')}")
+        print(f"   From: {result.get('sender')}")
+        print(f"   To: {result.get('to')}")
+        print(f"   Subject: {result.get('subject')}")
+    elif result.get('preview_only'):
+        print("📋 Preview shown. Email not saved/sent.")
+    else:
+        print(f"❌ Failed: {result.get('error')}")
+
+
+def _read_body_bytes(args):
+    """Return the email body as UTF-8 bytes from --body-file, --body or stdin"""
+    # Kept as bytes: the body is only ever written into the UTF-8 MIME buffer
+    if args.body_file:
+        return Path(args.body_file).read_bytes()
+    if args.body:
+        return args.body.encode('utf-8')
+    print("Enter email body (Ctrl+D to finish):")
+    return sys.stdin.buffer.read()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Send emails via Gmail API')
     parser.add_argument('--account', default=DEFAULT_ACCOUNT, help='Gmail account to use')
-    parser.add_argument('--to', required=True, help='Recipient email address')
-    parser.add_argument('--subject', required=True, help='Email subject')
+    parser.add_argument('--to', help='Recipient email address')
+    parser.add_argument('--subject', help='Email subject')
     parser.add_argument('--body', help='Email body (or use --body-file)')
     parser.add_argument('--body-file', help='File containing email body')
     parser.add_argument('--cc', help='CC recipients (comma-separated)')
@@ -284,21 +582,49 @@ def main():
     parser.add_argument('--from', dest='from_address', help='From address override')
     parser.add_argument('--reply-to', help='Thread ID to reply to')
     parser.add_argument('--reply-subject', help='Original subject (for replies)')
+    parser.add_argument('--reply-message-id',
+                        help='Message-ID header to reply to (skips the thread lookup)')
     parser.add_argument('--draft', action='store_true', help='Save as draft instead of sending')
     parser.add_argument('--yes', action='store_true', help='Auto-confirm without preview')
     parser.add_argument('--json', action='store_true', help='Output as JSON')
+    parser.add_argument('--recipients-file',
+                        help='JSONL of messages (to, subject, body, cc, bcc, thread_id) to send (requires --yes)')
+    parser.add_argument('--parallel', type=int, metavar='N',
+                        help='With --recipients-file, send N messages concurrently instead of batching')
     
     args = parser.parse_args()
     
-    # Get body content
-    if args.body_file:
-        with open(args.body_file, 'r') as f:
-            body = f.read()
-    elif args.body:
-        body = args.body
-    else:
-        print("Enter email body (Ctrl+D to finish):")
-        body = sys.stdin.read()
+    if args.recipients_file:
+        if not args.yes:
+            parser.error('--recipients-file requires --yes')
+        if args.parallel is not None and args.parallel < 1:
+            parser.error('--parallel must be at least 1')
+        
+        try:
+            messages = load_recipients_file(args.recipients_file)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        if args.parallel:
+            results = send_emails_parallel(args.account, messages, args.parallel,
+                                           from_address=args.from_address, draft=args.draft)
+        else:
+            results = send_emails_bulk(args.account, messages,
+                                       from_address=args.from_address, draft=args.draft)
+        
+        if args.json:
+            print(_dumps(results))
+        else:
+            for result in results:
+                print_result(result)
+        
+        sys.exit(0 if all(r.get('success') for r in results) else 1)
+    
+    if args.parallel:
+        parser.error('--parallel requires --recipients-file')
+    if not args.to or not args.subject:
+        parser.error('--to and --subject are required unless --recipients-file is given')
+    
+    body = _read_body_bytes(args)
     
     # Send email or reply
     if args.reply_to:
@@ -314,7 +640,8 @@ def main():
             cc=args.cc,
             auto_confirm=args.yes,
             from_address=args.from_address,
-            draft=args.draft
+            draft=args.draft,
+            in_reply_to_msgid=args.reply_message_id
         )
     else:
         result = send_email(
@@ -332,22 +659,9 @@ def main():
     
     # Output result
     if args.json:
-        print(json.dumps(result, indent=2))
+        print(_dumps(result))
     else:
-        if result.get('success'):
-            if result.get('is_draft'):
-                print(f"✅ Draft saved successfully!")
-                print(f"   Draft ID: {result.get('draft_id')}")
-            else:
-                print(f"✅ Email sent successfully!")
-                print(f"   Message ID: {result.get('message_id')}")
-            print(f"   From: {result.get('sender')}")
-            print(f"   To: {result.get('to')}")
-            print(f"   Subject: {result.get('subject')}")
-        elif result.get('preview_only'):
-            print("📋 Preview shown. Email not saved/sent.")
-        else:
-            print(f"❌ Failed: {result.get('error')}")
+        print_result(result)
     
     sys.exit(0 if result.get('success') else 1)
 